@@ -2,27 +2,81 @@
 """Main entry point for the Firebase MCP Server."""
 
 import argparse
+import io
 import logging
+import logging.handlers
 import sys
 from pathlib import Path
 
-from src.mcp_server_firebase.server import mcp, initialize_firebase_client
+
+class BatchingMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that writes buffered records to the target stream in one flush.
+
+    The stock MemoryHandler hands records to its target one at a time, and
+    StreamHandler flushes the stream after every record, so buffering alone does
+    not reduce the number of writes to stderr.
+    """
+
+    def flush(self) -> None:
+        """Write all buffered records and flush the target stream once.
+
+        A record that fails to format is reported through ``handleError`` like
+        in ``StreamHandler.emit``, and the buffer is always cleared so a bad
+        record cannot make every later flush fail.
+        """
+        self.acquire()
+        try:
+            target = self.target
+            try:
+                if isinstance(target, logging.StreamHandler):
+                    stream = target.stream
+                    for record in self.buffer:
+                        try:
+                            stream.write(self.format(record) + target.terminator)
+                        except Exception:
+                            self.handleError(record)
+                    stream.flush()
+                elif target is not None:
+                    for record in self.buffer:
+                        target.handle(record)
+            finally:
+                self.buffer.clear()
+        finally:
+            self.release()
 
 
 def setup_logging(debug: bool = False) -> None:
     """Set up logging configuration.
     
+    Log records are buffered and written to stderr in batches; a batch is
+    flushed when it fills up, when a WARNING or above is logged, once the
+    server has started, or at shutdown. Debug logging writes every record
+    immediately.
+
     Args:
         debug: Whether to enable debug logging
     """
     level = logging.DEBUG if debug else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stderr)
-        ]
+    handler: logging.Handler
+    if debug:
+        handler = logging.StreamHandler(sys.stderr)
+    else:
+        stream = io.TextIOWrapper(
+            sys.stderr.buffer,
+            encoding=sys.stderr.encoding,
+            errors="backslashreplace",
+            line_buffering=False,
+            write_through=False,
+        )
+        handler = BatchingMemoryHandler(
+            capacity=256,
+            flushLevel=logging.WARNING,
+            target=logging.StreamHandler(stream),
+        )
+    handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     )
+    logging.basicConfig(level=level, handlers=[handler])
 
 
 def main() -> None:
@@ -77,6 +131,10 @@ def main() -> None:
         logger.error(f"Credentials path is not a file: {credentials_path}")
         sys.exit(1)
     
+    # Import the server only after arguments are validated so that --help and
+    # argument errors return without loading FastMCP and the Firebase SDK
+    from src.mcp_server_firebase.server import mcp, initialize_firebase_client
+
     try:
         # Initialize Firebase client
         logger.info("Initializing Firebase client...")
@@ -85,13 +143,18 @@ def main() -> None:
         
         # Start MCP server
         logger.info(f"Starting MCP server with {args.transport} transport...")
-        
+        if args.transport == "http":
+            logger.info(f"Starting HTTP server on {args.host}:{args.port}")
+
+        # Write the startup messages now rather than waiting for a full batch
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+
         if args.transport == "stdio":
             # Use stdio transport for direct MCP client communication
             mcp.run()
         else:
             # Use HTTP transport for web-based access
-            logger.info(f"Starting HTTP server on {args.host}:{args.port}")
             mcp.run(transport="http", host=args.host, port=args.port)
             
     except KeyboardInterrupt:
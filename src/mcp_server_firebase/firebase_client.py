@@ -1,16 +1,122 @@
 """Firebase client initialization and management."""
 
+from __future__ import annotations
+
 import logging
-from typing import Any, Dict, List, Optional
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+    cast,
+)
+from urllib.parse import quote
+
+from .utils import logged_errors
+
+# firebase_admin and the Firestore client pull in the gRPC stack, which takes
+# hundreds of milliseconds to import; they are imported where first needed
+if TYPE_CHECKING:
+    import firebase_admin
+    from firebase_admin import firestore
+    from google.cloud.firestore_v1 import CollectionReference, FieldFilter, Query
+
+    # Queries start from a collection reference, which supports the same
+    # where/select/limit/stream calls but is not a Query subclass
+    Queryable = Union[CollectionReference, Query]
 
-import firebase_admin
-from dateutil.parser import parse as parse_datetime
-from firebase_admin import credentials, firestore, storage
+logger = logging.getLogger(__name__)
 
-# from google.cloud import storage as gcs
-from google.cloud.firestore_v1 import FieldFilter, Query
+T = TypeVar("T")
 
-logger = logging.getLogger(__name__)
+# Range filter values such as ">=2024-06-01": group 1 is the operator, group 2 the date
+_RANGE_RE = re.compile(r"^(>=|<=)(.*)", re.DOTALL)
+
+# Partial-response projection for bucket listings; only the blob properties
+# returned by search_asset_files are requested from the Storage API
+_BLOB_FIELDS = "items(name,size,contentType,timeCreated,etag,generation),nextPageToken"
+
+
+@lru_cache(maxsize=512)
+def _fromisoformat(date_str: str) -> datetime:
+    """Parse an ISO8601 date string, memoizing results for repeated filter literals."""
+    return datetime.fromisoformat(date_str)
+
+
+def _parse_date(date_str: str) -> datetime:
+    """Parse a date string.
+
+    ISO8601 strings, the documented filter format, go through the much faster
+    (and cached) ``datetime.fromisoformat``; anything else falls back to
+    dateutil. dateutil fills missing parts from today's date, so its results
+    are not cached.
+
+    Args:
+        date_str: Date string to parse
+
+    Returns:
+        Parsed datetime
+    """
+    try:
+        return _fromisoformat(date_str)
+    except ValueError:
+        from dateutil.parser import parse as parse_datetime
+
+        return parse_datetime(date_str)
+
+
+@lru_cache(maxsize=1024, typed=True)
+def _cached_field_filter(field: str, op: str, value: Any) -> FieldFilter:
+    """Build a FieldFilter, reusing the instance for repeated hashable filters.
+
+    ``typed=True`` keeps values such as ``1``, ``1.0`` and ``True`` apart, since
+    they compare equal but are distinct Firestore values.
+
+    Args:
+        field: Document field path
+        op: Firestore comparison operator
+        value: Hashable value to compare against
+
+    Returns:
+        Field filter for use in ``Query.where``
+    """
+    from google.cloud.firestore_v1 import FieldFilter
+
+    return FieldFilter(field, op, value)
+
+
+def _prefetch(items: Iterable[T]) -> Iterator[T]:
+    """Yield items while the next one is fetched on a background thread.
+
+    Used for paged listings so the request for the next page overlaps with
+    processing of the current one.
+
+    Args:
+        items: Iterable whose ``next()`` may block on I/O
+
+    Yields:
+        Items from the iterable, in order
+    """
+    iterator = iter(items)
+    done = object()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending: Future[Union[T, object]] = executor.submit(next, iterator, done)
+        while True:
+            item = pending.result()
+            if item is done:
+                return
+            pending = executor.submit(next, iterator, done)
+            yield cast(T, item)
 
 
 class FirebaseClient:
@@ -26,18 +132,24 @@ class FirebaseClient:
         self._app: Optional[firebase_admin.App] = None
         self._db: Optional[firestore.firestore.Client] = None
         self._bucket: Optional[Any] = None
+        self._collections: Dict[str, CollectionReference] = {}
 
+    @logged_errors("Failed to initialize Firebase client")
     def initialize(self) -> None:
         """Initialize Firebase Admin SDK."""
+        import firebase_admin
+        from firebase_admin import credentials, firestore, storage
+
+        # Apps are named after the credentials file, so an app initialized
+        # earlier in this process is only reused for the same credentials
         try:
+            self._app = firebase_admin.get_app(self.credentials_path)
+        except ValueError:
             cred = credentials.Certificate(self.credentials_path)
-            self._app = firebase_admin.initialize_app(cred)
-            self._db = firestore.client()
-            self._bucket = storage.bucket("owndays-dam.firebasestorage.app")
-            logger.info("Firebase client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Firebase client: {e}")
-            raise
+            self._app = firebase_admin.initialize_app(cred, name=self.credentials_path)
+        self._db = firestore.client(app=self._app)
+        self._bucket = storage.bucket("owndays-dam.firebasestorage.app", app=self._app)
+        logger.info("Firebase client initialized successfully")
 
     @property
     def db(self) -> firestore.firestore.Client:
@@ -53,7 +165,29 @@ class FirebaseClient:
             raise RuntimeError("Firebase client not initialized")
         return self._bucket
 
-    def _apply_filters(self, query: Query, filters: Dict[str, Any]) -> Query:
+    def _public_url_prefix(self) -> str:
+        """Build the public URL prefix shared by every blob in the bucket.
+
+        Returns:
+            Storage endpoint and bucket name, matching ``Blob.public_url``
+        """
+        return f"{self.bucket.client.api_endpoint}/{self.bucket.name}/"
+
+    def _collection(self, name: str) -> CollectionReference:
+        """Get a cached reference to a Firestore collection.
+
+        Args:
+            name: Collection name
+
+        Returns:
+            Collection reference, reused across calls
+        """
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = self.db.collection(name)
+        return collection
+
+    def _apply_filters(self, query: Queryable, filters: Dict[str, Any]) -> Queryable:
         """Apply filters to a Firestore query.
 
         Args:
@@ -63,122 +197,254 @@ class FirebaseClient:
         Returns:
             Modified query with filters applied
         """
+        from google.cloud.firestore_v1 import FieldFilter
+
         for field, value in filters.items():
-            if isinstance(value, str) and value.startswith(">="):
-                # Date range filter: ">=2024-06-01"
-                date_str = value[2:]
-                try:
-                    date_value = parse_datetime(date_str)
-                    query = query.where(filter=FieldFilter(field, ">=", date_value))
-                except ValueError:
-                    logger.warning(f"Invalid date format for field {field}: {date_str}")
-            elif isinstance(value, str) and value.startswith("<="):
-                # Date range filter: "<=2024-12-31"
-                date_str = value[2:]
+            match = _RANGE_RE.match(value) if isinstance(value, str) else None
+            if match:
+                # Date range filter: ">=2024-06-01" or "<=2024-12-31"
+                op, date_str = match.groups()
                 try:
-                    date_value = parse_datetime(date_str)
-                    query = query.where(filter=FieldFilter(field, "<=", date_value))
+                    date_value = _parse_date(date_str)
+                    query = query.where(filter=_cached_field_filter(field, op, date_value))
                 except ValueError:
                     logger.warning(f"Invalid date format for field {field}: {date_str}")
             elif isinstance(value, list):
                 # Array contains any filter
                 query = query.where(filter=FieldFilter(field, "array_contains_any", value))
-            else:
+            elif isinstance(value, (str, int, float, bool)):
                 # Equality filter
+                query = query.where(filter=_cached_field_filter(field, "==", value))
+            else:
+                # Equality filter on an unhashable value such as a map
                 query = query.where(filter=FieldFilter(field, "==", value))
 
         return query
 
-    def search_assets(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Search assets collection with optional filters.
+    def _apply_projection(self, query: Queryable, fields: List[str]) -> Queryable:
+        """Restrict a Firestore query to the given document fields.
 
         Args:
-            filters: Optional dictionary of filters to apply
+            query: Firestore query
+            fields: Field paths to return; ``id`` is always included
 
         Returns:
-            List of asset documents
+            Modified query returning only the requested fields
         """
-        try:
-            query = self.db.collection("assets")
+        field_paths = [field for field in fields if field != "id"]
+        # An empty projection means "all fields", so ask for the document name only
+        return query.select(field_paths or ["__name__"])
+
+    def _apply_pagination(
+        self,
+        query: Queryable,
+        collection: CollectionReference,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+    ) -> Queryable:
+        """Apply a result limit and start-after cursor to a Firestore query.
 
-            if filters:
-                query = self._apply_filters(query, filters)
+        Args:
+            query: Firestore query, with filters already applied
+            collection: Collection the query runs against
+            limit: Maximum number of documents to return
+            start_after: ID of the last document from the previous page
 
-            docs = query.stream()
-            results = []
+        Returns:
+            Modified query with pagination applied
 
-            for doc in docs:
-                data = doc.to_dict()
-                data["id"] = doc.id
-                results.append(data)
+        Raises:
+            ValueError: If limit is less than 1 or the start_after document does not exist
+        """
+        if limit is not None and limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+        if start_after:
+            # A snapshot cursor keeps pages consistent with Firestore's implicit
+            # ordering (inequality fields, then document ID) for any filter set
+            snapshot = collection.document(start_after).get()
+            if not snapshot.exists:
+                raise ValueError(f"start_after document not found: {start_after}")
+            query = query.start_after(snapshot)
+        if limit is not None:
+            query = query.limit(limit)
 
-            logger.info(f"Found {len(results)} assets")
-            return results
+        return query
 
-        except Exception as e:
-            logger.error(f"Error searching assets: {e}")
-            raise
+    def _iter_docs(self, query: Queryable) -> Iterator[Dict[str, Any]]:
+        """Lazily yield documents from a Firestore query as they arrive.
 
-    def search_versions(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Search versions collection with optional filters.
+        Args:
+            query: Firestore query to execute
+
+        Yields:
+            Document dictionaries with their ``id`` included
+        """
+        for doc in query.stream():
+            # to_dict() returns a fresh copy of the document data, so it can be
+            # extended in place instead of being copied into another dict;
+            # it is None for a snapshot of a document that does not exist
+            data = doc.to_dict() or {}
+            data["id"] = doc.id
+            yield data
+
+    def _collect(self, query: Queryable) -> List[Dict[str, Any]]:
+        """Stream a Firestore query into a list of documents.
 
         Args:
-            filters: Optional dictionary of filters to apply
+            query: Firestore query to execute
 
         Returns:
-            List of version documents
+            List of document dictionaries with their ``id`` included
         """
-        try:
-            query = self.db.collection("versions")
+        # list() over the generator grows geometrically in C; preallocating a
+        # limit-sized list and assigning by index is slower in pure Python
+        return list(self._iter_docs(query))
+
+    @logged_errors("Error searching {collection_name}")
+    def _search(
+        self,
+        collection_name: str,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search a Firestore collection with optional filters.
 
-            if filters:
-                query = self._apply_filters(query, filters)
+        Args:
+            collection_name: Name of the collection to search
+            filters: Optional dictionary of filters to apply
+            limit: Optional maximum number of documents to return
+            start_after: Optional ID of the last document from the previous page
+            fields: Optional list of fields to return instead of whole documents
 
-            docs = query.stream()
-            results = []
+        Returns:
+            List of matching documents
+        """
+        collection = self._collection(collection_name)
+        query: Queryable = collection
+
+        if filters:
+            query = self._apply_filters(query, filters)
+        if fields:
+            query = self._apply_projection(query, fields)
+        query = self._apply_pagination(query, collection, limit, start_after)
+
+        results = self._collect(query)
+
+        logger.debug("Found %d %s", len(results), collection_name)
+        if limit is not None and len(results) == limit:
+            logger.info(
+                "%s search returned a full page of %d; more may follow after %s",
+                collection_name,
+                limit,
+                results[-1]["id"],
+            )
+        return results
+
+    def search_assets(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search assets collection with optional filters.
 
-            for doc in docs:
-                data = doc.to_dict()
-                data["id"] = doc.id
-                results.append(data)
+        Args:
+            filters: Optional dictionary of filters to apply
+            limit: Optional maximum number of documents to return
+            start_after: Optional ID of the last document from the previous page
+            fields: Optional list of fields to return instead of whole documents
 
-            logger.info(f"Found {len(results)} versions")
-            return results
+        Returns:
+            List of asset documents
+        """
+        return self._search("assets", filters, limit, start_after, fields)
+
+    def search_versions(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search versions collection with optional filters.
 
-        except Exception as e:
-            logger.error(f"Error searching versions: {e}")
-            raise
+        Args:
+            filters: Optional dictionary of filters to apply
+            limit: Optional maximum number of documents to return
+            start_after: Optional ID of the last document from the previous page
+            fields: Optional list of fields to return instead of whole documents
 
-    def search_comments(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        Returns:
+            List of version documents
+        """
+        return self._search("versions", filters, limit, start_after, fields)
+
+    def search_comments(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
         """Search comments collection with optional filters.
 
         Args:
             filters: Optional dictionary of filters to apply
+            limit: Optional maximum number of documents to return
+            start_after: Optional ID of the last document from the previous page
+            fields: Optional list of fields to return instead of whole documents
 
         Returns:
             List of comment documents
         """
-        try:
-            query = self.db.collection("comments")
+        return self._search("comments", filters, limit, start_after, fields)
 
-            if filters:
-                query = self._apply_filters(query, filters)
+    @logged_errors("Error getting asset {asset_id}")
+    def get_asset(self, asset_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single asset document by ID.
 
-            docs = query.stream()
-            results = []
+        Args:
+            asset_id: Asset document ID
 
-            for doc in docs:
-                data = doc.to_dict()
-                data["id"] = doc.id
-                results.append(data)
+        Returns:
+            Asset document, or None if it does not exist
+        """
+        snapshot = self._collection("assets").document(asset_id).get()
+        if not snapshot.exists:
+            return None
+        data = snapshot.to_dict() or {}
+        data["id"] = snapshot.id
+        return data
 
-            logger.info(f"Found {len(results)} comments")
-            return results
+    def search_asset_bundle(self, asset_id: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Fetch an asset together with its versions and comments.
 
-        except Exception as e:
-            logger.error(f"Error searching comments: {e}")
-            raise
+        The three Firestore lookups are independent, so they run concurrently and
+        the call takes roughly as long as the slowest one.
 
+        Args:
+            asset_id: Asset document ID
+            limit: Optional maximum number of versions and of comments to return
+
+        Returns:
+            Dictionary with ``asset``, ``versions`` and ``comments`` keys
+        """
+        related = {"assetId": asset_id}
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            asset = executor.submit(self.get_asset, asset_id)
+            versions = executor.submit(self.search_versions, related, limit)
+            comments = executor.submit(self.search_comments, related, limit)
+
+            return {
+                "asset": asset.result(),
+                "versions": versions.result(),
+                "comments": comments.result(),
+            }
+
+    @logged_errors("Error searching asset files")
     def search_asset_files(self, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search files in the asset storage bucket with optional filters.
 
@@ -188,52 +454,48 @@ class FirebaseClient:
         Returns:
             List of file metadata dictionaries
         """
-        try:
-            prefix = filters.get("prefix", "") if filters else ""
-            content_type_filter = filters.get("contentType") if filters else None
-            uploaded_at_filter = filters.get("uploadedAt") if filters else None
-
-            blobs = self.bucket.list_blobs(prefix=prefix)
-            results = []
-
-            for blob in blobs:
-                # Apply content type filter
-                if content_type_filter and blob.content_type != content_type_filter:
+        prefix = filters.get("prefix", "") if filters else ""
+        content_type_filter = filters.get("contentType") if filters else None
+        uploaded_at_filter = filters.get("uploadedAt") if filters else None
+
+        # Parse the upload date filter once rather than per blob
+        date_op = filter_date = None
+        match = _RANGE_RE.match(uploaded_at_filter) if isinstance(uploaded_at_filter, str) else None
+        if match:
+            date_op, date_str = match.groups()
+            try:
+                filter_date = _parse_date(date_str)
+            except ValueError:
+                logger.warning(f"Invalid date format: {date_str}")
+
+        # Content types are matched per blob: narrowing the listing by file
+        # extension would drop blobs whose names do not carry one
+        blobs = self.bucket.list_blobs(prefix=prefix, fields=_BLOB_FIELDS)
+        url_prefix = self._public_url_prefix()
+        results = []
+
+        for blob in chain.from_iterable(_prefetch(blobs.pages)):
+            # Apply content type filter
+            if content_type_filter and blob.content_type != content_type_filter:
+                continue
+
+            # Apply upload date filter
+            if filter_date is not None:
+                if date_op == ">=" and blob.time_created < filter_date:
+                    continue
+                if date_op == "<=" and blob.time_created > filter_date:
                     continue
 
-                # Apply upload date filter
-                if uploaded_at_filter and isinstance(uploaded_at_filter, str):
-                    if uploaded_at_filter.startswith(">="):
-                        date_str = uploaded_at_filter[2:]
-                        try:
-                            filter_date = parse_datetime(date_str)
-                            if blob.time_created < filter_date:
-                                continue
-                        except ValueError:
-                            logger.warning(f"Invalid date format: {date_str}")
-                    elif uploaded_at_filter.startswith("<="):
-                        date_str = uploaded_at_filter[2:]
-                        try:
-                            filter_date = parse_datetime(date_str)
-                            if blob.time_created > filter_date:
-                                continue
-                        except ValueError:
-                            logger.warning(f"Invalid date format: {date_str}")
-
-                file_info = {
-                    "name": blob.name,
-                    "size": blob.size,
-                    "contentType": blob.content_type,
-                    "uploadedAt": blob.time_created.isoformat() if blob.time_created else None,
-                    "downloadUrl": blob.public_url,
-                    "etag": blob.etag,
-                    "generation": blob.generation,
-                }
-                results.append(file_info)
-
-            logger.info(f"Found {len(results)} files")
-            return results
-
-        except Exception as e:
-            logger.error(f"Error searching asset files: {e}")
-            raise
+            file_info = {
+                "name": blob.name,
+                "size": blob.size,
+                "contentType": blob.content_type,
+                "uploadedAt": blob.time_created.isoformat() if blob.time_created else None,
+                "downloadUrl": url_prefix + quote(blob.name, safe="/~"),
+                "etag": blob.etag,
+                "generation": blob.generation,
+            }
+            results.append(file_info)
+
+        logger.debug("Found %d files", len(results))
+        return results
@@ -1,30 +1,49 @@
 """MCP Server implementation for Firebase access."""
 
 import logging
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
+import orjson
 from fastmcp import FastMCP
 
-from .firebase_client import FirebaseClient
+from .utils import logged_errors
+
+if TYPE_CHECKING:
+    from .firebase_client import FirebaseClient
 
 logger = logging.getLogger(__name__)
 
+# Default page size for Firestore search tools
+DEFAULT_PAGE_SIZE = 1000
+
 # Global Firebase client instance
-firebase_client: Optional[FirebaseClient] = None
+firebase_client: Optional["FirebaseClient"] = None
 
 
 def initialize_firebase_client(credentials_path: str) -> None:
     """Initialize the global Firebase client.
 
+    The Firebase client module is imported here rather than at module level so
+    that firebase_admin and the gRPC stack are only loaded once the server is
+    actually starting. Calling it again with the same credentials path keeps
+    the existing client; a client is only kept once it initialized successfully.
+
     Args:
         credentials_path: Path to the service account JSON file
     """
     global firebase_client
-    firebase_client = FirebaseClient(credentials_path)
-    firebase_client.initialize()
+    if firebase_client is not None and firebase_client.credentials_path == credentials_path:
+        return
+
+    from .firebase_client import FirebaseClient
 
+    client = FirebaseClient(credentials_path)
+    client.initialize()
+    firebase_client = client
 
-def get_firebase_client() -> FirebaseClient:
+
+def get_firebase_client() -> "FirebaseClient":
     """Get the initialized Firebase client.
 
     Returns:
@@ -38,12 +57,71 @@ def get_firebase_client() -> FirebaseClient:
     return firebase_client
 
 
+def _json_default(obj: Any) -> Any:
+    """Convert values orjson cannot serialize natively.
+
+    The conversions follow FastMCP's default pydantic serializer, so tool
+    output keeps the same JSON for these types.
+
+    Args:
+        obj: Value that orjson rejected
+
+    Returns:
+        A JSON-compatible representation of the value
+    """
+    if isinstance(obj, datetime):
+        # Firestore timestamps are datetime subclasses, which orjson does not
+        # accept; a plain datetime is then rendered like any other
+        return datetime(
+            obj.year,
+            obj.month,
+            obj.day,
+            obj.hour,
+            obj.minute,
+            obj.second,
+            obj.microsecond,
+            obj.tzinfo,
+            fold=obj.fold,
+        )
+    if isinstance(obj, bytes):
+        try:
+            return obj.decode()
+        except UnicodeDecodeError:
+            return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def serialize_tool_result(data: Any) -> str:
+    """Serialize a tool result to compact JSON text using orjson.
+
+    Output matches FastMCP's default serializer: naive datetimes carry no
+    offset, UTC datetimes end in ``Z``, bytes are decoded as UTF-8 and
+    unsupported values fall back to ``str()``. NaN and infinite floats are
+    written as ``null``.
+
+    Args:
+        data: Tool return value
+
+    Returns:
+        JSON-encoded string
+    """
+    return orjson.dumps(data, default=_json_default, option=orjson.OPT_UTC_Z).decode()
+
+
 # Initialize FastMCP
-mcp: FastMCP = FastMCP("Firebase MCP Server")
+mcp: FastMCP = FastMCP("Firebase MCP Server", tool_serializer=serialize_tool_result)
 
 
 @mcp.tool()
-def search_assets(filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+@logged_errors("Error in search_assets")
+def search_assets(
+    filter: Optional[Dict[str, Any]] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    start_after: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
     """Search assets in the Firestore assets collection.
 
     The assets collection contains digital asset metadata with the following fields:
@@ -66,6 +144,15 @@ def search_assets(filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any
             - uploader: string - Filter by uploader user ID
             - uploadedAt: string - Filter by upload date (use ">=2024-06-01" format)
             - updatedAt: string - Filter by update date (use ">=2024-06-01" format)
+        limit: Maximum number of asset documents to return, at least 1 (default 1000).
+            Documents beyond the limit are not returned: if exactly `limit`
+            documents come back, more may match.
+        start_after: ID of the last document from the previous page. When a
+            search returns `limit` documents, call it again with the same filter
+            and start_after set to the last document's id to get the next page.
+        fields: Optional list of fields to return (e.g. ["title", "category"]).
+            Only these fields and the document id are fetched, which keeps
+            responses small when full documents are not needed.
 
     Returns:
         List of asset documents matching the filters
@@ -81,16 +168,18 @@ def search_assets(filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any
         })
         ```
     """
-    try:
-        client = get_firebase_client()
-        return client.search_assets(filter)
-    except Exception as e:
-        logger.error(f"Error in search_assets: {e}")
-        raise
+    client = get_firebase_client()
+    return client.search_assets(filter, limit=limit, start_after=start_after, fields=fields)
 
 
 @mcp.tool()
-def search_versions(filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+@logged_errors("Error in search_versions")
+def search_versions(
+    filter: Optional[Dict[str, Any]] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    start_after: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
     """Search versions in the Firestore versions collection.
 
     The versions collection contains version metadata for assets with the following fields:
@@ -111,6 +200,15 @@ def search_versions(filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, A
             - fileType: string - Filter by MIME type
             - updatedBy: string - Filter by user who updated the version
             - updatedAt: string - Filter by update date (use ">=2024-06-01" format)
+        limit: Maximum number of version documents to return, at least 1 (default 1000).
+            Documents beyond the limit are not returned: if exactly `limit`
+            documents come back, more may match.
+        start_after: ID of the last document from the previous page. When a
+            search returns `limit` documents, call it again with the same filter
+            and start_after set to the last document's id to get the next page.
+        fields: Optional list of fields to return (e.g. ["fileName", "fileType"]).
+            Only these fields and the document id are fetched, which keeps
+            responses small when full documents are not needed.
 
     Returns:
         List of version documents matching the filters
@@ -125,16 +223,18 @@ def search_versions(filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, A
         })
         ```
     """
-    try:
-        client = get_firebase_client()
-        return client.search_versions(filter)
-    except Exception as e:
-        logger.error(f"Error in search_versions: {e}")
-        raise
+    client = get_firebase_client()
+    return client.search_versions(filter, limit=limit, start_after=start_after, fields=fields)
 
 
 @mcp.tool()
-def search_comments(filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+@logged_errors("Error in search_comments")
+def search_comments(
+    filter: Optional[Dict[str, Any]] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    start_after: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
     """Search comments in the Firestore comments collection.
 
     The comments collection contains user comments on assets with the following fields:
@@ -149,6 +249,15 @@ def search_comments(filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, A
             - assetId: string - Filter by asset ID
             - user: string - Filter by user ID
             - createdAt: string - Filter by creation date (use ">=2024-06-01" format)
+        limit: Maximum number of comment documents to return, at least 1 (default 1000).
+            Documents beyond the limit are not returned: if exactly `limit`
+            documents come back, more may match.
+        start_after: ID of the last document from the previous page. When a
+            search returns `limit` documents, call it again with the same filter
+            and start_after set to the last document's id to get the next page.
+        fields: Optional list of fields to return (e.g. ["user", "text"]).
+            Only these fields and the document id are fetched, which keeps
+            responses small when full documents are not needed.
 
     Returns:
         List of comment documents matching the filters
@@ -163,15 +272,44 @@ def search_comments(filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, A
         })
         ```
     """
-    try:
-        client = get_firebase_client()
-        return client.search_comments(filter)
-    except Exception as e:
-        logger.error(f"Error in search_comments: {e}")
-        raise
+    client = get_firebase_client()
+    return client.search_comments(filter, limit=limit, start_after=start_after, fields=fields)
+
+
+@mcp.tool()
+@logged_errors("Error in search_asset_bundle")
+def search_asset_bundle(asset_id: str, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """Get an asset together with all of its versions and comments.
+
+    Use this instead of calling search_assets, search_versions and search_comments
+    one after another when you need the full view of a single asset. The three
+    Firestore lookups run concurrently.
+
+    Args:
+        asset_id: ID of the asset document
+        limit: Maximum number of versions and of comments to return, at least 1
+            (default 1000). Documents beyond the limit are not returned: if
+            exactly `limit` versions or comments come back, use search_versions
+            or search_comments with start_after to page through the rest.
+
+    Returns:
+        Dictionary with the following fields:
+        - asset: dict | null - The asset document, or null if it does not exist
+        - versions: list[dict] - Version documents whose assetId matches
+        - comments: list[dict] - Comment documents whose assetId matches
+
+    Example:
+        ```python
+        # Get asset123 with its version history and comments
+        search_asset_bundle("asset123")
+        ```
+    """
+    client = get_firebase_client()
+    return client.search_asset_bundle(asset_id, limit=limit)
 
 
 @mcp.tool()
+@logged_errors("Error in search_asset_files")
 def search_asset_files(filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
     """Search files in the Firebase Storage bucket.
 
@@ -204,9 +342,5 @@ def search_asset_files(filter: Optional[Dict[str, Any]] = None) -> List[Dict[str
         })
         ```
     """
-    try:
-        client = get_firebase_client()
-        return client.search_asset_files(filter)
-    except Exception as e:
-        logger.error(f"Error in search_asset_files: {e}")
-        raise
+    client = get_firebase_client()
+    return client.search_asset_files(filter)
@@ -0,0 +1,46 @@
+"""Shared helpers for the Firebase MCP server."""
+
+import inspect
+import logging
+from functools import wraps
+from typing import Any, Callable, TypeVar, cast
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def logged_errors(message: str) -> Callable[[F], F]:
+    """Log exceptions raised by the decorated function, then re-raise them.
+
+    The error is logged on the decorated function's module logger as
+    ``"<message>: <exception>"``. The message may reference the function's
+    arguments with ``str.format`` fields, e.g. ``"Error getting asset {asset_id}"``;
+    it is only formatted when an exception occurs.
+
+    Args:
+        message: Log message prefix
+
+    Returns:
+        Decorator applying the error logging
+    """
+
+    def decorator(fn: F) -> F:
+        logger = logging.getLogger(fn.__module__)
+        signature = inspect.signature(fn)
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                try:
+                    bound = signature.bind(*args, **kwargs)
+                    bound.apply_defaults()
+                    label = message.format(**bound.arguments)
+                except (TypeError, KeyError, IndexError):
+                    label = message
+                logger.error(f"{label}: {e}")
+                raise
+
+        return cast(F, wrapper)
+
+    return decorator
@@ -1,9 +1,11 @@
 """Pytest configuration and fixtures."""
 
+import copy
 import json
 import os
 import tempfile
 from datetime import datetime
+from types import MappingProxyType
 from unittest.mock import Mock, patch
 
 import pytest
@@ -196,6 +198,80 @@ def mock_storage_blobs():
     return [_create_mock_blob(file_data) for file_data in TEST_FILES]
 
 
+@pytest.fixture(scope="session")
+def firebase_mock_template():
+    """Canned FirebaseClient results, built once per test session.
+
+    Treat the template as read-only: ``firebase_mock`` hands each test deep
+    copies of these results and its own Mock, so neither data changes nor call
+    records leak between tests.
+    """
+    return {
+        "search_assets": [
+            {"id": "asset1", "title": "Test Asset", "category": "Template", "visibility": "public"}
+        ],
+        "search_versions": [
+            {
+                "id": "version1",
+                "assetId": "asset123",
+                "version": "v1.0",
+                "fileType": "image/png",
+                "fileSize": 2048,
+            }
+        ],
+        "search_comments": [
+            {"id": "comment1", "assetId": "asset123", "user": "user456", "text": "Great asset!"}
+        ],
+        "search_asset_files": [
+            {
+                "name": "assets/test.jpg",
+                "size": 1024,
+                "contentType": "image/jpeg",
+                "downloadUrl": "https://test.com/test.jpg",
+            }
+        ],
+        "search_asset_bundle": {
+            "asset": {"id": "asset123", "title": "Test Asset"},
+            "versions": [{"id": "version1", "assetId": "asset123"}],
+            "comments": [],
+        },
+    }
+
+
+@pytest.fixture
+def firebase_mock(firebase_mock_template):
+    """Mock FirebaseClient returning the canned results.
+
+    The mock is specced against ``FirebaseClient`` so calls to methods the
+    client does not have fail instead of silently returning a child Mock.
+    """
+    from src.mcp_server_firebase.firebase_client import FirebaseClient
+
+    mock_client = Mock(spec=FirebaseClient)
+    for method_name, result in firebase_mock_template.items():
+        getattr(mock_client, method_name).return_value = copy.deepcopy(result)
+    return mock_client
+
+
+@pytest.fixture
+def patched_get_client(monkeypatch, firebase_mock):
+    """Make the MCP tools use ``firebase_mock`` as their Firebase client."""
+    import src.mcp_server_firebase.server as server_module
+
+    monkeypatch.setattr(server_module, "get_firebase_client", lambda: firebase_mock)
+    return firebase_mock
+
+
+@pytest.fixture(scope="session")
+def large_asset_dataset():
+    """1000 minimal asset documents, built once per session.
+
+    Returned as a tuple of read-only mappings so the shared data cannot be
+    mutated by a test; copy them with ``dict()`` where plain dicts are needed.
+    """
+    return tuple(MappingProxyType({"id": f"asset_{i}", "title": f"Asset {i}"}) for i in range(1000))
+
+
 @pytest.fixture
 def sample_filter():
     """Sample filter for testing."""
@@ -1,241 +1,193 @@
-"""Integration tests for MCP protocol communication."""
+"""Integration tests for MCP protocol communication.
 
+Tools are exercised in-process through their underlying functions (``tool.fn``)
+rather than by spawning ``main.py`` over a stdio transport per test, so no
+subprocess or MCP session start-up is paid in the suite. Protocol-level
+behaviour is covered by a FastMCP client connected to the server in memory.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
+import orjson
 import pytest
+from fastmcp import Client
+
+import src.mcp_server_firebase.server as server_module
+from src.mcp_server_firebase.server import (
+    DEFAULT_PAGE_SIZE,
+    get_firebase_client,
+    initialize_firebase_client,
+    mcp,
+    search_asset_bundle,
+    search_asset_files,
+    search_assets,
+    search_comments,
+    search_versions,
+)
+
+# Underlying functions of the tools, resolved once from the FastMCP wrappers
+TOOL_FNS = {
+    tool.name: tool.fn
+    for tool in (
+        search_assets,
+        search_versions,
+        search_comments,
+        search_asset_bundle,
+        search_asset_files,
+    )
+}
+
+
+# Serve every tool in this module from the mock client
+pytestmark = pytest.mark.usefixtures("patched_get_client")
+
+
+def assert_single_asset(result, expected_id="asset1", expected_title="Test Asset"):
+    """Assert a search_assets result holds exactly the expected asset.
+
+    Shared by the direct-call and protocol-level tests so both transports are
+    held to the same expectations.
+    """
+    assert isinstance(result, list)
+    assert len(result) == 1
+    assert result[0]["id"] == expected_id
+    assert result[0]["title"] == expected_title
 
 
 @pytest.mark.integration
 class TestMCPProtocolIntegration:
     """Test MCP protocol integration via FastMCP tool underlying functions."""
 
-    @patch("src.mcp_server_firebase.server.initialize_firebase_client")
-    @patch("src.mcp_server_firebase.server.get_firebase_client")
-    def test_mcp_server_initialization(
-        self, mock_get_client, mock_init_client, test_credentials_file
+    def test_mcp_server_initialization(self, monkeypatch, test_credentials_file):
+        """Test the server initializes and serves its global Firebase client."""
+        # Setup mocks: start without a client and patch the client class
+        monkeypatch.setattr(server_module, "firebase_client", None)
+
+        with patch("src.mcp_server_firebase.firebase_client.FirebaseClient") as client_class:
+            client_class.return_value.credentials_path = test_credentials_file
+
+            # Test
+            initialize_firebase_client(test_credentials_file)
+            initialize_firebase_client(test_credentials_file)
+            client = get_firebase_client()
+
+        # Verify the client is built and initialized once, then reused
+        client_class.assert_called_once_with(test_credentials_file)
+        client_class.return_value.initialize.assert_called_once_with()
+        assert client is client_class.return_value
+
+    @pytest.mark.parametrize(
+        "tool_name,key,expected",
+        [
+            ("search_assets", "id", "asset1"),
+            ("search_versions", "assetId", "asset123"),
+            ("search_comments", "user", "user456"),
+            ("search_asset_files", "name", "assets/test.jpg"),
+        ],
+    )
+    def test_search_tool_via_mcp(
+        self, firebase_mock, firebase_mock_template, tool_name, key, expected
     ):
-        """Test MCP server initialization via direct calls."""
-        from src.mcp_server_firebase.server import get_firebase_client, initialize_firebase_client
-
-        # Setup mocks
-        mock_client = Mock()
-        mock_client.search_assets.return_value = []
-        mock_get_client.return_value = mock_client
-
-        # Test initialization
-        initialize_firebase_client(test_credentials_file)
-
-        # Verify client is available
-        client = get_firebase_client()
-        assert client == mock_client
-
-        # Verify Firebase client methods are available
-        assert hasattr(client, "search_assets")
-        assert hasattr(client, "search_versions")
-        assert hasattr(client, "search_comments")
-        assert hasattr(client, "search_asset_files")
-
-    @patch("src.mcp_server_firebase.server.get_firebase_client")
-    def test_search_assets_via_mcp(self, mock_get_client, test_credentials_file):
-        """Test search_assets tool via direct calls."""
-        from src.mcp_server_firebase.server import search_assets
-
-        # Setup mock data
-        mock_client = Mock()
-        mock_client.search_assets.return_value = [
-            {"id": "asset1", "title": "Test Asset", "category": "Template", "visibility": "public"}
-        ]
-        mock_get_client.return_value = mock_client
-
-        # Call the MCP tool underlying function using .fn attribute
-        result = search_assets.fn()
+        """Test each search tool via direct calls."""
+        # Call the MCP tool underlying function
+        result = TOOL_FNS[tool_name]()
 
-        # Verify result
-        assert isinstance(result, list)
+        # Verify result is the canned result configured for the client method
+        assert result == firebase_mock_template[tool_name]
         assert len(result) == 1
-        assert result[0]["id"] == "asset1"
-        assert result[0]["title"] == "Test Asset"
+        assert result[0][key] == expected
 
         # Verify mock was called
-        mock_client.search_assets.assert_called_once()
+        getattr(firebase_mock, tool_name).assert_called_once()
 
-    @patch("src.mcp_server_firebase.server.get_firebase_client")
-    def test_search_assets_with_filter_via_mcp(self, mock_get_client, test_credentials_file):
+    def test_search_assets_with_filter_via_mcp(self, firebase_mock):
         """Test search_assets with filter via direct calls."""
-        from src.mcp_server_firebase.server import search_assets
-
-        # Setup mock data
-        mock_client = Mock()
-        mock_client.search_assets.return_value = [
-            {"id": "public_asset", "title": "Public Asset", "visibility": "public"}
-        ]
-        mock_get_client.return_value = mock_client
-
         # Call underlying function with filter
         filter_params = {"visibility": "public"}
-        result = search_assets.fn(filter_params)
+        result = TOOL_FNS["search_assets"](filter_params)
 
         # Verify result
-        assert isinstance(result, list)
-        assert len(result) == 1
+        assert_single_asset(result)
         assert result[0]["visibility"] == "public"
 
         # Verify mock was called with filter
-        mock_client.search_assets.assert_called_once_with(filter_params)
-
-    @patch("src.mcp_server_firebase.server.get_firebase_client")
-    def test_search_versions_via_mcp(self, mock_get_client, test_credentials_file):
-        """Test search_versions tool via direct calls."""
-        from src.mcp_server_firebase.server import search_versions
-
-        # Setup mock data
-        mock_client = Mock()
-        mock_client.search_versions.return_value = [
-            {
-                "id": "version1",
-                "assetId": "asset123",
-                "version": "v1.0",
-                "fileType": "image/png",
-                "fileSize": 2048,
-            }
-        ]
-        mock_get_client.return_value = mock_client
-
-        # Call the MCP tool underlying function using .fn attribute
-        result = search_versions.fn()
-
-        # Verify result
-        assert isinstance(result, list)
-        assert len(result) == 1
-        assert result[0]["id"] == "version1"
-        assert result[0]["assetId"] == "asset123"
-
-        # Verify mock was called
-        mock_client.search_versions.assert_called_once()
-
-    @patch("src.mcp_server_firebase.server.get_firebase_client")
-    def test_search_comments_via_mcp(self, mock_get_client, test_credentials_file):
-        """Test search_comments tool via direct calls."""
-        from src.mcp_server_firebase.server import search_comments
-
-        # Setup mock data
-        mock_client = Mock()
-        mock_client.search_comments.return_value = [
-            {
-                "id": "comment1",
-                "assetId": "asset123",
-                "user": "user456",
-                "text": "Great asset!",
-            }
-        ]
-        mock_get_client.return_value = mock_client
-
-        # Call the MCP tool underlying function using .fn attribute
-        result = search_comments.fn()
-
-        # Verify result
-        assert isinstance(result, list)
-        assert len(result) == 1
-        assert result[0]["id"] == "comment1"
-        assert result[0]["user"] == "user456"
-
-        # Verify mock was called
-        mock_client.search_comments.assert_called_once()
-
-    @patch("src.mcp_server_firebase.server.get_firebase_client")
-    def test_search_asset_files_via_mcp(self, mock_get_client, test_credentials_file):
-        """Test search_asset_files tool via direct calls."""
-        from src.mcp_server_firebase.server import search_asset_files
-
-        # Setup mock data
-        mock_client = Mock()
-        mock_client.search_asset_files.return_value = [
-            {
-                "name": "assets/test.jpg",
-                "size": 1024,
-                "contentType": "image/jpeg",
-                "downloadUrl": "https://test.com/test.jpg",
-            }
-        ]
-        mock_get_client.return_value = mock_client
+        firebase_mock.search_assets.assert_called_once_with(
+            filter_params, limit=DEFAULT_PAGE_SIZE, start_after=None, fields=None
+        )
 
-        # Call the MCP tool underlying function using .fn attribute
-        result = search_asset_files.fn()
+    def test_search_asset_bundle_via_mcp(self, firebase_mock):
+        """Test search_asset_bundle tool via direct calls."""
+        # Call the MCP tool underlying function
+        result = TOOL_FNS["search_asset_bundle"]("asset123")
 
         # Verify result
-        assert isinstance(result, list)
-        assert len(result) == 1
-        assert result[0]["name"] == "assets/test.jpg"
-        assert result[0]["contentType"] == "image/jpeg"
+        assert result["asset"]["id"] == "asset123"
+        assert len(result["versions"]) == 1
+        assert result["comments"] == []
 
         # Verify mock was called
-        mock_client.search_asset_files.assert_called_once()
-
-    @patch("src.mcp_server_firebase.server.get_firebase_client")
-    def test_all_tools_via_mcp(self, mock_get_client, test_credentials_file):
-        """Test all MCP tools via direct calls."""
-        from src.mcp_server_firebase.server import (
-            search_asset_files,
-            search_assets,
-            search_comments,
-            search_versions,
+        firebase_mock.search_asset_bundle.assert_called_once_with(
+            "asset123", limit=DEFAULT_PAGE_SIZE
         )
 
-        # Setup mock data
-        mock_client = Mock()
-        mock_client.search_assets.return_value = [{"id": "asset1", "title": "Test"}]
-        mock_client.search_versions.return_value = [{"id": "version1", "assetId": "asset1"}]
-        mock_client.search_comments.return_value = [{"id": "comment1", "assetId": "asset1"}]
-        mock_client.search_asset_files.return_value = [{"name": "test.jpg", "size": 1024}]
-        mock_get_client.return_value = mock_client
-
-        # Test all tools
-        tools_and_functions = [
-            ("search_assets", search_assets),
-            ("search_versions", search_versions),
-            ("search_comments", search_comments),
-            ("search_asset_files", search_asset_files),
-        ]
-
-        for tool_name, tool_function in tools_and_functions:
-            result = tool_function.fn()
-            assert isinstance(result, list)
-            assert len(result) == 1  # Each mock returns 1 item
 
-        # Verify all mocks were called
-        mock_client.search_assets.assert_called()
-        mock_client.search_versions.assert_called()
-        mock_client.search_comments.assert_called()
-        mock_client.search_asset_files.assert_called()
+@pytest.mark.integration
+class TestMCPProtocolInMemory:
+    """Test the MCP protocol layer with an in-memory client session."""
+
+    @pytest.mark.asyncio
+    async def test_list_tools(self):
+        """Test all tools are advertised over the protocol."""
+        async with Client(mcp) as client:
+            tools = await client.list_tools()
+
+        assert {tool.name for tool in tools} == {
+            "search_assets",
+            "search_versions",
+            "search_comments",
+            "search_asset_bundle",
+            "search_asset_files",
+        }
+
+    @pytest.mark.asyncio
+    async def test_call_tool(self, firebase_mock):
+        """Test a tool call round-trips arguments and JSON results."""
+        async with Client(mcp) as client:
+            result = await client.call_tool(
+                "search_assets", {"filter": {"visibility": "public"}, "limit": 10}
+            )
+
+        assets = orjson.loads(result.content[0].text)
+        assert_single_asset(assets)
+        assert assets[0]["visibility"] == "public"
+        firebase_mock.search_assets.assert_called_once_with(
+            {"visibility": "public"}, limit=10, start_after=None, fields=None
+        )
 
 
 @pytest.mark.integration
 class TestMCPServerErrorHandling:
     """Test MCP server error handling."""
 
-    @patch("src.mcp_server_firebase.server.initialize_firebase_client")
-    def test_invalid_credentials_file(self, mock_init_client):
-        """Test behavior with invalid credentials file."""
-        mock_init_client.side_effect = Exception("Invalid credentials")
+    def test_invalid_credentials_file(self, monkeypatch):
+        """Test initialization fails for a missing credentials file."""
+        # Start from a fresh process state: no client and no default Firebase app
+        monkeypatch.setattr(server_module, "firebase_client", None)
+        monkeypatch.setattr("firebase_admin.get_app", Mock(side_effect=ValueError))
 
-        # This test would verify the server handles initialization errors gracefully
-        # In practice, the server should log the error and exit gracefully
-        with pytest.raises(Exception):
-            mock_init_client("/invalid/path/credentials.json")
+        with pytest.raises(FileNotFoundError):
+            initialize_firebase_client("/invalid/path/credentials.json")
 
-    @patch("src.mcp_server_firebase.server.get_firebase_client")
-    def test_firebase_permission_error_via_mcp(self, mock_get_client, test_credentials_file):
+    def test_firebase_permission_error_via_mcp(self, firebase_mock):
         """Test Firebase permission error handling via MCP."""
-        from src.mcp_server_firebase.server import search_assets
-
         # Setup mock to raise permission error
-        mock_client = Mock()
-        mock_client.search_assets.side_effect = Exception("Permission denied")
-        mock_get_client.return_value = mock_client
+        firebase_mock.search_assets.side_effect = Exception("Permission denied")
 
         # This should propagate the error from underlying function
         with pytest.raises(Exception, match="Permission denied"):
-            search_assets.fn()
+            TOOL_FNS["search_assets"]()
 
 
 @pytest.mark.integration
@@ -243,44 +195,56 @@ class TestMCPServerErrorHandling:
 class TestMCPServerPerformance:
     """Test MCP server performance characteristics."""
 
-    @patch("src.mcp_server_firebase.server.get_firebase_client")
-    def test_concurrent_tool_calls(self, mock_get_client, test_credentials_file):
-        """Test concurrent tool calls via direct calls."""
-        from src.mcp_server_firebase.server import search_assets, search_versions
+    def test_concurrent_tool_calls(self, firebase_mock):
+        """Test tool calls run concurrently via direct calls."""
+        delay = 0.1
 
-        # Setup mock data
-        mock_client = Mock()
-        mock_client.search_assets.return_value = [{"id": f"asset_{i}"} for i in range(10)]
-        mock_client.search_versions.return_value = [{"id": f"version_{i}"} for i in range(5)]
-        mock_get_client.return_value = mock_client
+        def slow_result(result):
+            def side_effect(*args, **kwargs):
+                time.sleep(delay)
+                return result
 
-        # Make multiple calls to underlying functions
-        assets_result = search_assets.fn()
-        versions_result = search_versions.fn()
-        filtered_assets_result = search_assets.fn({"visibility": "public"})
+            return side_effect
+
+        # Setup mock data with a simulated Firestore round-trip
+        firebase_mock.search_assets.side_effect = slow_result(
+            [{"id": f"asset_{i}"} for i in range(10)]
+        )
+        firebase_mock.search_versions.side_effect = slow_result(
+            [{"id": f"version_{i}"} for i in range(5)]
+        )
+
+        # Make the calls from a thread pool
+        calls = [
+            (TOOL_FNS["search_assets"], ()),
+            (TOOL_FNS["search_versions"], ()),
+            (TOOL_FNS["search_assets"], ({"visibility": "public"},)),
+        ]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            futures = [executor.submit(fn, *args) for fn, args in calls]
+            assets_result, versions_result, filtered_assets_result = [
+                future.result() for future in futures
+            ]
+        elapsed = time.perf_counter() - start
 
         # Verify all calls succeeded
         assert len(assets_result) == 10
         assert len(versions_result) == 5
         assert isinstance(filtered_assets_result, list)
 
-        # Verify multiple calls were made
-        assert mock_client.search_assets.call_count >= 2
-        assert mock_client.search_versions.call_count >= 1
+        # Verify the calls overlapped instead of running back to back
+        assert elapsed < delay * len(calls)
+        assert firebase_mock.search_assets.call_count == 2
+        assert firebase_mock.search_versions.call_count == 1
 
-    @patch("src.mcp_server_firebase.server.get_firebase_client")
-    def test_large_dataset_handling(self, mock_get_client, test_credentials_file):
+    def test_large_dataset_handling(self, firebase_mock, large_asset_dataset):
         """Test handling of large datasets via direct calls."""
-        from src.mcp_server_firebase.server import search_assets
-
         # Setup mock data - simulate large dataset
-        mock_client = Mock()
-        large_dataset = [{"id": f"asset_{i}", "title": f"Asset {i}"} for i in range(1000)]
-        mock_client.search_assets.return_value = large_dataset
-        mock_get_client.return_value = mock_client
+        firebase_mock.search_assets.return_value = [dict(a) for a in large_asset_dataset]
 
         # Test large dataset call to underlying function
-        result = search_assets.fn()
+        result = TOOL_FNS["search_assets"]()
 
         # Verify result
         assert len(result) == 1000
@@ -288,4 +252,4 @@ class TestMCPServerPerformance:
         assert result[999]["id"] == "asset_999"
 
         # Verify mock was called
-        mock_client.search_assets.assert_called_once()
+        firebase_mock.search_assets.assert_called_once()
@@ -0,0 +1,49 @@
+"""Unit test fixtures."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(scope="class")
+def firebase_patches():
+    """Patch the firebase_admin entry points used by ``FirebaseClient.initialize()``.
+
+    The patches are started once per test class; use ``firebase_mocks`` in
+    tests, which resets them between tests.
+    """
+    with (
+        patch("firebase_admin.credentials.Certificate") as cert,
+        patch("firebase_admin.initialize_app") as app,
+        patch("firebase_admin.firestore.client") as firestore,
+        patch("firebase_admin.storage.bucket") as bucket,
+    ):
+        yield SimpleNamespace(cert=cert, app=app, firestore=firestore, bucket=bucket)
+
+
+@pytest.fixture(autouse=True)
+def firebase_mocks(firebase_patches):
+    """The firebase_admin patches, reset after every test.
+
+    Resetting return values and side effects as well as call records means
+    each test sees fresh ``firestore.client()`` and ``storage.bucket()`` mocks.
+    """
+    yield firebase_patches
+    for mock in vars(firebase_patches).values():
+        mock.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture
+def initialized_client(firebase_mocks, test_credentials_file):
+    """FirebaseClient initialized against the ``firebase_mocks`` patches.
+
+    ``client.db`` and ``client.bucket`` are the mocks returned by
+    ``firestore.client()`` and ``storage.bucket()``; tests configure them
+    after initialization instead of wiring up their own.
+    """
+    from src.mcp_server_firebase.firebase_client import FirebaseClient
+
+    client = FirebaseClient(test_credentials_file)
+    client.initialize()
+    return client
@@ -1,10 +1,15 @@
 """Core functionality tests for Firebase MCP Server."""
 
+import json
+import logging
+from datetime import datetime, timezone
 from unittest.mock import Mock, patch
 
 import pytest
+from dateutil.parser import parse as parse_datetime
 
-from src.mcp_server_firebase.firebase_client import FirebaseClient
+import src.mcp_server_firebase.server as server_module
+from src.mcp_server_firebase.firebase_client import _BLOB_FIELDS, FirebaseClient
 
 
 @pytest.mark.unit
@@ -29,215 +34,390 @@ class TestFirebaseClientCore:
         with pytest.raises(RuntimeError, match="Firebase client not initialized"):
             _ = client.bucket
 
-    @patch("firebase_admin.credentials.Certificate")
-    @patch("firebase_admin.initialize_app")
-    @patch("firebase_admin.firestore.client")
-    @patch("firebase_admin.storage.bucket")
-    def test_successful_initialization(
-        self, mock_bucket, mock_firestore, mock_app, mock_cert, test_credentials_file
-    ):
+    def test_successful_initialization(self, firebase_mocks, test_credentials_file):
         """Test successful Firebase initialization."""
-        # Setup mocks
-        mock_cert.return_value = Mock()
-        mock_app.return_value = Mock()
-        mock_db = Mock()
-        mock_bucket_obj = Mock()
-        mock_firestore.return_value = mock_db
-        mock_bucket.return_value = mock_bucket_obj
-
         # Test
         client = FirebaseClient(test_credentials_file)
         client.initialize()
 
         # Verify
-        assert client.db == mock_db
-        assert client.bucket == mock_bucket_obj
-        mock_cert.assert_called_once()
-        mock_app.assert_called_once()
-        mock_firestore.assert_called_once()
-        mock_bucket.assert_called_once_with("owndays-dam.firebasestorage.app")
+        assert client.db is firebase_mocks.firestore.return_value
+        assert client.bucket is firebase_mocks.bucket.return_value
+        app = firebase_mocks.app.return_value
+        firebase_mocks.cert.assert_called_once_with(test_credentials_file)
+        firebase_mocks.app.assert_called_once_with(
+            firebase_mocks.cert.return_value, name=test_credentials_file
+        )
+        firebase_mocks.firestore.assert_called_once_with(app=app)
+        firebase_mocks.bucket.assert_called_once_with("owndays-dam.firebasestorage.app", app=app)
+
+    def test_initialization_reuses_existing_app(
+        self, monkeypatch, firebase_mocks, test_credentials_file
+    ):
+        """Test an app already initialized for the same credentials is reused."""
+        existing_app = Mock()
+        mock_get_app = Mock(return_value=existing_app)
+        monkeypatch.setattr("firebase_admin.get_app", mock_get_app)
+
+        client = FirebaseClient(test_credentials_file)
+        client.initialize()
+
+        assert client._app is existing_app
+        mock_get_app.assert_called_once_with(test_credentials_file)
+        firebase_mocks.cert.assert_not_called()
+        firebase_mocks.app.assert_not_called()
+
+    def test_initialization_with_different_credentials(self, firebase_mocks):
+        """Test clients with different credentials get separate apps."""
+        first_app, second_app = Mock(), Mock()
+        firebase_mocks.app.side_effect = [first_app, second_app]
+
+        first = FirebaseClient("/test/first.json")
+        first.initialize()
+        second = FirebaseClient("/test/second.json")
+        second.initialize()
+
+        assert first._app is first_app
+        assert second._app is second_app
+        assert [c.kwargs["name"] for c in firebase_mocks.app.call_args_list] == [
+            "/test/first.json",
+            "/test/second.json",
+        ]
+        firebase_mocks.cert.assert_any_call("/test/second.json")
+        firebase_mocks.firestore.assert_called_with(app=second_app)
 
 
 @pytest.mark.unit
 class TestSearchFunctionality:
     """Test search functionality with mocked Firebase."""
 
-    @patch("firebase_admin.credentials.Certificate")
-    @patch("firebase_admin.initialize_app")
-    @patch("firebase_admin.firestore.client")
-    @patch("firebase_admin.storage.bucket")
-    def test_search_assets(
-        self, mock_bucket, mock_firestore, mock_app, mock_cert, test_credentials_file
-    ):
+    def test_search_assets(self, initialized_client, mock_firestore_query):
         """Test assets search functionality."""
         # Setup mocks
-        mock_cert.return_value = Mock()
-        mock_app.return_value = Mock()
-
-        mock_db = Mock()
-        mock_collection = Mock()
-        mock_db.collection.return_value = mock_collection
-        mock_firestore.return_value = mock_db
-        mock_bucket.return_value = Mock()
-
-        # Setup document response
-        mock_doc = Mock()
-        mock_doc.id = "test_asset"
-        mock_doc.to_dict.return_value = {
-            "title": "Test Asset",
-            "category": "Template",
-            "visibility": "public",
-        }
-        mock_collection.stream.return_value = [mock_doc]
+        mock_db = initialized_client.db
+        mock_db.collection.return_value = mock_firestore_query
 
         # Test
-        client = FirebaseClient(test_credentials_file)
-        client.initialize()
+        client = initialized_client
         results = client.search_assets()
 
         # Verify
-        assert len(results) == 1
-        assert results[0]["id"] == "test_asset"
-        assert results[0]["title"] == "Test Asset"
+        assert [r["id"] for r in results] == ["asset1", "asset2"]
+        assert results[0]["title"] == "Test Asset 1"
         mock_db.collection.assert_called_with("assets")
 
-    @patch("firebase_admin.credentials.Certificate")
-    @patch("firebase_admin.initialize_app")
-    @patch("firebase_admin.firestore.client")
-    @patch("firebase_admin.storage.bucket")
-    def test_search_asset_files(
-        self, mock_bucket, mock_firestore, mock_app, mock_cert, test_credentials_file
-    ):
-        """Test asset files search functionality."""
-        from datetime import datetime
-
+    def test_collection_reference_reused(self, initialized_client):
+        """Test collection references are created once and reused."""
         # Setup mocks
-        mock_cert.return_value = Mock()
-        mock_app.return_value = Mock()
-        mock_firestore.return_value = Mock()
+        mock_db = initialized_client.db
+        mock_db.collection.return_value.stream.return_value = []
 
-        mock_bucket_obj = Mock()
-        mock_bucket.return_value = mock_bucket_obj
+        # Test
+        client = initialized_client
+        client.search_assets()
+        client.search_assets()
+
+        # Verify
+        mock_db.collection.assert_called_once_with("assets")
+
+    def test_search_asset_files(self, initialized_client):
+        """Test asset files search functionality."""
+        mock_bucket_obj = initialized_client.bucket
+        mock_bucket_obj.name = "test-bucket"
+        mock_bucket_obj.client.api_endpoint = "https://storage.googleapis.com"
 
         # Setup blob response
         mock_blob = Mock()
-        mock_blob.name = "assets/test.jpg"
-        mock_blob.size = 1024
-        mock_blob.content_type = "image/jpeg"
-        mock_blob.time_created = datetime(2024, 1, 1)
-        mock_blob.public_url = "https://test.com/test.jpg"
-        mock_blob.etag = "test-etag"
-        mock_blob.generation = 1
-        mock_bucket_obj.list_blobs.return_value = [mock_blob]
+        mock_blob.configure_mock(
+            name="assets/test image.jpg",
+            size=1024,
+            content_type="image/jpeg",
+            time_created=datetime(2024, 1, 1),
+            etag="test-etag",
+            generation=1,
+        )
+        mock_bucket_obj.list_blobs.return_value.pages = [[mock_blob]]
 
         # Test
-        client = FirebaseClient(test_credentials_file)
-        client.initialize()
+        client = initialized_client
         results = client.search_asset_files()
 
         # Verify
         assert len(results) == 1
-        assert results[0]["name"] == "assets/test.jpg"
+        assert results[0]["name"] == "assets/test image.jpg"
         assert results[0]["contentType"] == "image/jpeg"
         assert results[0]["size"] == 1024
-        mock_bucket_obj.list_blobs.assert_called_with(prefix="")
-
-    @patch("firebase_admin.credentials.Certificate")
-    @patch("firebase_admin.initialize_app")
-    @patch("firebase_admin.firestore.client")
-    @patch("firebase_admin.storage.bucket")
-    def test_search_with_filters(
-        self, mock_bucket, mock_firestore, mock_app, mock_cert, test_credentials_file
-    ):
+        assert results[0]["downloadUrl"] == (
+            "https://storage.googleapis.com/test-bucket/assets/test%20image.jpg"
+        )
+        mock_bucket_obj.list_blobs.assert_called_with(prefix="", fields=_BLOB_FIELDS)
+
+    def test_search_asset_bundle(self, initialized_client):
+        """Test fetching an asset with its versions and comments."""
+        # Setup mocks
+        mock_db = initialized_client.db
+        collections = {name: Mock() for name in ("assets", "versions", "comments")}
+        mock_db.collection.side_effect = collections.__getitem__
+
+        snapshot = Mock(
+            exists=True, id="asset1", to_dict=Mock(return_value={"title": "Test Asset"})
+        )
+        collections["assets"].document.return_value.get.return_value = snapshot
+
+        for name, doc_id in (("versions", "version1"), ("comments", "comment1")):
+            mock_doc = Mock(id=doc_id, to_dict=Mock(return_value={"assetId": "asset1"}))
+            query = collections[name].where.return_value
+            query.limit.return_value.stream.return_value = [mock_doc]
+
+        # Test
+        client = initialized_client
+        bundle = client.search_asset_bundle("asset1", limit=50)
+
+        # Verify
+        assert bundle["asset"] == {"id": "asset1", "title": "Test Asset"}
+        assert [v["id"] for v in bundle["versions"]] == ["version1"]
+        assert [c["id"] for c in bundle["comments"]] == ["comment1"]
+        collections["assets"].document.assert_called_once_with("asset1")
+        for name in ("versions", "comments"):
+            collections[name].where.return_value.limit.assert_called_once_with(50)
+
+    def test_get_asset_missing(self, initialized_client):
+        """Test a missing asset document returns None."""
+        # Setup mocks
+        mock_db = initialized_client.db
+        mock_db.collection.return_value.document.return_value.get.return_value.exists = False
+
+        # Test
+        client = initialized_client
+
+        assert client.get_asset("missing") is None
+
+    def test_search_with_filters(self, initialized_client, mock_firestore_query):
         """Test search with filters."""
         # Setup mocks
-        mock_cert.return_value = Mock()
-        mock_app.return_value = Mock()
+        initialized_client.db.collection.return_value = mock_firestore_query
+
+        # Test
+        client = initialized_client
+        results = client.search_assets({"visibility": "public"})
 
-        mock_db = Mock()
+        # Verify
+        assert results[0]["id"] == "asset1"
+        mock_firestore_query.where.assert_called_once()
+        assert mock_firestore_query.where.call_args.kwargs["filter"].value == "public"
+
+    def test_search_with_pagination(self, initialized_client):
+        """Test limit and start_after are applied to the query."""
+        # Setup mocks
+        mock_db = initialized_client.db
         mock_collection = Mock()
-        mock_query = Mock()
         mock_db.collection.return_value = mock_collection
-        mock_collection.where.return_value = mock_query
-        mock_firestore.return_value = mock_db
-        mock_bucket.return_value = Mock()
 
-        # Setup filtered response
-        mock_doc = Mock()
-        mock_doc.id = "filtered_asset"
-        mock_doc.to_dict.return_value = {"title": "Filtered Asset", "visibility": "public"}
-        mock_query.stream.return_value = [mock_doc]
+        cursor_snapshot = Mock(exists=True)
+        mock_collection.document.return_value.get.return_value = cursor_snapshot
+        mock_paged = mock_collection.start_after.return_value.limit.return_value
+        mock_paged.stream.return_value = []
 
         # Test
-        client = FirebaseClient(test_credentials_file)
-        client.initialize()
-        results = client.search_assets({"visibility": "public"})
+        client = initialized_client
+        results = client.search_versions(limit=50, start_after="version50")
 
         # Verify
-        assert len(results) == 1
-        assert results[0]["id"] == "filtered_asset"
-        mock_collection.where.assert_called()
-
-    @patch("firebase_admin.credentials.Certificate")
-    @patch("firebase_admin.initialize_app")
-    @patch("firebase_admin.firestore.client")
-    @patch("firebase_admin.storage.bucket")
-    def test_error_handling(
-        self, mock_bucket, mock_firestore, mock_app, mock_cert, test_credentials_file
-    ):
-        """Test error handling."""
+        assert results == []
+        mock_collection.document.assert_called_once_with("version50")
+        mock_collection.start_after.assert_called_once_with(cursor_snapshot)
+        mock_collection.start_after.return_value.limit.assert_called_once_with(50)
+
+    def test_search_with_missing_document_data(self, initialized_client):
+        """Test a snapshot without data is returned with only its id."""
         # Setup mocks
-        mock_cert.return_value = Mock()
-        mock_app.return_value = Mock()
+        mock_db = initialized_client.db
+        mock_doc = Mock(id="asset1", to_dict=Mock(return_value=None))
+        mock_db.collection.return_value.stream.return_value = [mock_doc]
+
+        # Test
+        results = initialized_client.search_assets()
 
-        mock_db = Mock()
+        # Verify
+        assert results == [{"id": "asset1"}]
+
+    def test_search_with_field_projection(self, initialized_client):
+        """Test requested fields are pushed down as a Firestore projection."""
+        # Setup mocks
+        mock_db = initialized_client.db
         mock_collection = Mock()
         mock_db.collection.return_value = mock_collection
-        mock_collection.stream.side_effect = Exception("Database error")
-        mock_firestore.return_value = mock_db
-        mock_bucket.return_value = Mock()
+
+        mock_doc = Mock(id="asset1", to_dict=Mock(return_value={"title": "Test Asset"}))
+        mock_collection.select.return_value.stream.return_value = [mock_doc]
 
         # Test
-        client = FirebaseClient(test_credentials_file)
-        client.initialize()
+        client = initialized_client
+        results = client.search_assets(fields=["id", "title"])
+        client.search_assets(fields=["id"])
+
+        # Verify
+        assert results == [{"title": "Test Asset", "id": "asset1"}]
+        assert mock_collection.select.call_args_list[0].args == (["title"],)
+        assert mock_collection.select.call_args_list[1].args == (["__name__"],)
+
+    @pytest.mark.parametrize("limit", [0, -1])
+    def test_search_with_invalid_limit(self, initialized_client, limit):
+        """Test a limit below 1 is rejected instead of meaning "no limit"."""
+        with pytest.raises(ValueError, match="limit must be at least 1"):
+            initialized_client.search_assets(limit=limit)
+
+    def test_search_full_page_is_logged(self, initialized_client, caplog):
+        """Test a page cut off at the limit is logged with the next cursor."""
+        # Setup mocks
+        mock_docs = [Mock(id=f"asset{i}", to_dict=Mock(return_value={})) for i in range(2)]
+        limited = initialized_client.db.collection.return_value.limit.return_value
+        limited.stream.return_value = mock_docs
+
+        # Test
+        with caplog.at_level(logging.INFO):
+            results = initialized_client.search_assets(limit=2)
 
+        # Verify
+        assert len(results) == 2
+        assert "assets search returned a full page of 2; more may follow after asset1" in (
+            caplog.text
+        )
+
+    def test_search_with_unknown_cursor(self, initialized_client):
+        """Test a start_after cursor pointing at a missing document is rejected."""
+        # Setup mocks
+        mock_db = initialized_client.db
+        mock_db.collection.return_value.document.return_value.get.return_value.exists = False
+
+        # Test
+        client = initialized_client
+
+        with pytest.raises(ValueError, match="start_after document not found"):
+            client.search_comments(start_after="missing")
+
+    @pytest.mark.parametrize(
+        "method,collection_name",
+        [
+            ("search_assets", "assets"),
+            ("search_versions", "versions"),
+            ("search_comments", "comments"),
+        ],
+    )
+    def test_error_handling(self, initialized_client, caplog, method, collection_name):
+        """Test Firestore errors are logged and propagated."""
+        # Setup mocks
+        initialized_client.db.collection.return_value.stream.side_effect = Exception(
+            "Database error"
+        )
+
+        # Test
         with pytest.raises(Exception, match="Database error"):
-            client.search_assets()
+            getattr(initialized_client, method)()
+
+        # Verify
+        assert f"Error searching {collection_name}: Database error" in caplog.text
 
 
 @pytest.mark.unit
 class TestMCPServerIntegration:
     """Test MCP server integration components."""
 
-    @patch("src.mcp_server_firebase.server.FirebaseClient")
+    @patch("src.mcp_server_firebase.firebase_client.FirebaseClient")
     def test_server_initialization(self, mock_firebase_client_class):
         """Test server initialization process."""
-        from src.mcp_server_firebase.server import get_firebase_client, initialize_firebase_client
-
         mock_client = Mock()
         mock_firebase_client_class.return_value = mock_client
 
         # Test initialization
-        initialize_firebase_client("/test/credentials.json")
+        server_module.initialize_firebase_client("/test/credentials.json")
 
         # Verify
         mock_firebase_client_class.assert_called_once_with("/test/credentials.json")
         mock_client.initialize.assert_called_once()
 
         # Test getting client
-        result = get_firebase_client()
+        result = server_module.get_firebase_client()
         assert result == mock_client
 
+    @patch("src.mcp_server_firebase.firebase_client.FirebaseClient")
+    def test_server_initialization_is_idempotent(self, mock_firebase_client_class):
+        """Test re-initializing with the same credentials keeps the existing client."""
+        server_module.firebase_client = None
+        mock_client = Mock()
+        mock_client.credentials_path = "/test/path/credentials.json"
+        mock_firebase_client_class.return_value = mock_client
+
+        server_module.initialize_firebase_client("/test/path/credentials.json")
+        server_module.initialize_firebase_client("/test/path/credentials.json")
+
+        mock_firebase_client_class.assert_called_once_with("/test/path/credentials.json")
+        mock_client.initialize.assert_called_once()
+
+        # A different credentials path creates and initializes a new client
+        server_module.initialize_firebase_client("/test/other/credentials.json")
+        mock_firebase_client_class.assert_called_with("/test/other/credentials.json")
+        assert mock_client.initialize.call_count == 2
+
+        server_module.firebase_client = None
+
+    @patch("src.mcp_server_firebase.firebase_client.FirebaseClient")
+    def test_server_initialization_retries_after_failure(self, mock_firebase_client_class):
+        """Test a failed initialization is not kept, so a retry initializes again."""
+        server_module.firebase_client = None
+        mock_client = Mock()
+        mock_client.credentials_path = "/test/path/credentials.json"
+        mock_client.initialize.side_effect = [FileNotFoundError("missing"), None]
+        mock_firebase_client_class.return_value = mock_client
+
+        with pytest.raises(FileNotFoundError):
+            server_module.initialize_firebase_client("/test/path/credentials.json")
+        assert server_module.firebase_client is None
+
+        server_module.initialize_firebase_client("/test/path/credentials.json")
+
+        assert mock_client.initialize.call_count == 2
+        assert server_module.get_firebase_client() is mock_client
+
+        server_module.firebase_client = None
+
     def test_uninitialized_client_error(self):
         """Test error when accessing uninitialized client."""
-        import src.mcp_server_firebase.server as server_module
-        from src.mcp_server_firebase.server import get_firebase_client
-
         # Reset global state
         server_module.firebase_client = None
 
         with pytest.raises(RuntimeError, match="Firebase client not initialized"):
-            get_firebase_client()
+            server_module.get_firebase_client()
+
+    def test_tool_result_serializer(self):
+        """Test tool results keep the JSON format of FastMCP's default serializer."""
+
+        class Timestamp(datetime):
+            """Stand-in for Firestore's datetime subclass."""
+
+        data = [
+            {
+                "id": "asset1",
+                "tags": ["banner"],
+                "uploadedAt": Timestamp(2024, 6, 1, tzinfo=timezone.utc),
+                "updatedAt": datetime(2024, 6, 2, 9, 30),
+                "checksum": b"abc",
+                "labels": {"banner"},
+            }
+        ]
+
+        result = json.loads(server_module.serialize_tool_result(data))
+
+        assert result == [
+            {
+                "id": "asset1",
+                "tags": ["banner"],
+                "uploadedAt": "2024-06-01T00:00:00Z",
+                "updatedAt": "2024-06-02T09:30:00",
+                "checksum": "abc",
+                "labels": ["banner"],
+            }
+        ]
 
 
 @pytest.mark.unit
@@ -246,32 +426,125 @@ class TestUtilityFunctions:
 
     def test_date_parsing(self):
         """Test date parsing functionality."""
-        from dateutil.parser import parse as parse_datetime
-
         # Test various date formats
         test_dates = ["2024-01-01", "2024-01-01T10:00:00Z", "2024-06-15T14:30:00.123Z"]
 
         for date_str in test_dates:
-            parsed = parse_datetime(date_str)
+            parsed = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
             assert parsed.year == 2024
             assert isinstance(parsed.month, int)
             assert isinstance(parsed.day, int)
 
     def test_filter_operators(self):
         """Test filter operator recognition."""
-        # Test various filter patterns
-        filters = {
-            "equality": "public",
-            "date_gte": ">=2024-01-01",
-            "date_lte": "<=2024-12-31",
-            "array": ["tag1", "tag2"],
-        }
-
-        # Verify filter patterns
-        for key, value in filters.items():
-            if key == "equality":
-                assert isinstance(value, str) and not value.startswith((">=", "<="))
-            elif key.startswith("date_"):
-                assert isinstance(value, str) and (value.startswith(">=") or value.startswith("<="))
-            elif key == "array":
-                assert isinstance(value, list)
+        assert not "public".startswith((">=", "<="))
+        assert ">=2024-01-01".startswith(">=")
+        assert "<=2024-12-31".startswith("<=")
+        assert isinstance(["tag1", "tag2"], list)
+
+    def test_date_parsing_is_cached(self):
+        """Test repeated ISO8601 literals reuse the cached parse result."""
+        from src.mcp_server_firebase.firebase_client import _fromisoformat, _parse_date
+
+        _fromisoformat.cache_clear()
+        first = _parse_date("2024-06-01")
+        second = _parse_date("2024-06-01")
+
+        assert first is second
+        assert _fromisoformat.cache_info().hits == 1
+
+    def test_relative_date_parsing_is_not_cached(self):
+        """Test dateutil results, which depend on today's date, are not cached."""
+        from src.mcp_server_firebase.firebase_client import _fromisoformat, _parse_date
+
+        _fromisoformat.cache_clear()
+        with patch("dateutil.parser.parse", side_effect=[datetime(2024, 6, 1, 10)] * 2) as parse:
+            _parse_date("10:00")
+            _parse_date("10:00")
+
+        assert parse.call_count == 2
+        assert _fromisoformat.cache_info().currsize == 0
+
+    def test_cached_date_parsing_formats(self):
+        """Test ISO8601 and free-form dates parse to the same values as dateutil."""
+        from src.mcp_server_firebase.firebase_client import _parse_date
+
+        for date_str in [
+            "2024-06-01",
+            "2024-06-01T10:00:00+09:00",
+            "2024-06-15T14:30:00Z",
+            "June 1 2024",
+        ]:
+            assert _parse_date(date_str) == parse_datetime(date_str)
+
+    def test_range_filter_operators(self):
+        """Test range prefixes are translated into Firestore where clauses."""
+        client = FirebaseClient("/test/credentials.json")
+        mock_query = Mock()
+        mock_query.where.return_value = mock_query
+
+        client._apply_filters(
+            mock_query, {"uploadedAt": ">=2024-06-01", "updatedAt": "<=2024-12-31"}
+        )
+
+        ops = [call.kwargs["filter"].op_string for call in mock_query.where.call_args_list]
+        assert ops == [">=", "<="]
+
+    def test_prefetch_preserves_order(self):
+        """Test prefetched pages are yielded in order and exhausted cleanly."""
+        from src.mcp_server_firebase.firebase_client import _prefetch
+
+        pages = [["a", "b"], [], ["c"]]
+
+        assert list(_prefetch(pages)) == pages
+        assert list(_prefetch([])) == []
+
+    def test_field_filters_are_cached(self):
+        """Test identical hashable filters reuse one FieldFilter instance."""
+        client = FirebaseClient("/test/credentials.json")
+        mock_query = Mock()
+        mock_query.where.return_value = mock_query
+
+        client._apply_filters(mock_query, {"visibility": "public", "fileSize": 1})
+        client._apply_filters(mock_query, {"visibility": "public", "fileSize": True})
+
+        filters = [call.kwargs["filter"] for call in mock_query.where.call_args_list]
+        assert filters[0] is filters[2]
+        assert filters[1] is not filters[3]
+        assert filters[3].value is True
+
+    def test_logged_errors_decorator(self, caplog):
+        """Test errors are logged with argument-formatted messages and re-raised."""
+        from src.mcp_server_firebase.utils import logged_errors
+
+        @logged_errors("Error loading {name}")
+        def load(name, strict=True):
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            load("assets")
+
+        assert "Error loading assets: boom" in caplog.text
+
+    def test_batching_log_handler_survives_bad_record(self, capsys):
+        """Test a record that fails to format is reported and dropped from the buffer."""
+        import io
+
+        from main import BatchingMemoryHandler
+
+        stream = io.StringIO()
+        handler = BatchingMemoryHandler(
+            capacity=10, flushLevel=logging.WARNING, target=logging.StreamHandler(stream)
+        )
+        logger = logging.getLogger("test_batching_log_handler")
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            logger.warning("bad %d", "x")
+            logger.warning("good %d", 1)
+        finally:
+            logger.removeHandler(handler)
+
+        assert stream.getvalue() == "good 1\n"
+        assert handler.buffer == []
+        assert "Logging error" in capsys.readouterr().err